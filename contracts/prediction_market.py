@@ -2,6 +2,7 @@
 
 from genlayer import *
 from dataclasses import dataclass
+from datetime import datetime
 import json
 import typing
 
@@ -12,6 +13,9 @@ DEFAULT_GENERATED_ODDS = {
     "odds_team2": "2.80",
 }
 
+MAX_ADJUDICATION_BATCH = 3
+DISPUTE_QUEUE_WINDOW_SECONDS = 3600
+
 
 def strip_code_fences(value: str) -> str:
     return value.replace("```json", "").replace("```", "").strip()
@@ -95,6 +99,30 @@ def validate_generated_odds_payload(payload: typing.Any) -> dict:
     }
 
 
+def validate_adjudication_rulings(rulings: typing.Any, market_ids: list) -> dict:
+    if set(rulings.keys()) != {str(market_id) for market_id in market_ids}:
+        raise ValueError("Rulings do not match adjudicated markets")
+
+    for correct_winner in rulings.values():
+        if not isinstance(correct_winner, int) or correct_winner < -1 or correct_winner > 2:
+            raise ValueError("Invalid correct winner")
+
+    return rulings
+
+
+def validate_adjudication_payload(payload: typing.Any, market_ids: list) -> dict:
+    parsed = parse_json_response(payload)
+
+    rulings = {}
+    for ruling in parsed["rulings"]:
+        rulings[str(int(ruling["market_id"]))] = int(ruling["correct_winner"])
+
+    return validate_adjudication_rulings(
+        {str(market_id): rulings.get(str(market_id)) for market_id in market_ids},
+        market_ids,
+    )
+
+
 @allow_storage
 @dataclass
 class Market:
@@ -112,6 +140,7 @@ class Market:
     winner: i8  # -1=unresolved, 0=draw, 1=team1, 2=team2
     total_pool: u256
     created_at: u256
+    adjudicated: bool  # True once disputes have been ruled on
 
 
 @allow_storage
@@ -141,7 +170,12 @@ class PredictionMarket(gl.Contract):
     markets: TreeMap[u256, Market]
     user_balances: TreeMap[Address, u256]
     bets: TreeMap[u256, DynArray[Bet]]
-    disputes: TreeMap[u256, Dispute]
+    disputes: TreeMap[u256, DynArray[Dispute]]
+    user_open_stake: TreeMap[Address, u256]
+    user_open_payout: TreeMap[Address, u256]
+    user_claimable: TreeMap[Address, TreeMap[u256, u256]]
+    user_claimable_total: TreeMap[Address, u256]
+    user_dispute_stake: TreeMap[Address, u256]
     next_market_id: u256
     protocol_fee_bps: u16
     initial_balance: u256
@@ -169,6 +203,49 @@ class PredictionMarket(gl.Contract):
             return self.user_balances[user]
         return self.initial_balance
 
+    def _get_counter_or_zero(self, counters: TreeMap[Address, u256], user: Address) -> u256:
+        """Read a per-user counter, treating missing users as zero."""
+        if user in counters:
+            return counters[user]
+        return u256(0)
+
+    def _add_claimable(self, user: Address, market_id: u256, amount: u256):
+        """Credit net winnings a user can claim from a resolved market."""
+        user_claimable = self.user_claimable.get_or_insert_default(user)
+        if market_id in user_claimable:
+            user_claimable[market_id] = user_claimable[market_id] + amount
+        else:
+            user_claimable[market_id] = amount
+        self.user_claimable_total[user] = (
+            self._get_counter_or_zero(self.user_claimable_total, user) + amount
+        )
+
+    def _remove_claimable(self, user: Address, market_id: u256) -> u256:
+        """Drop a user's claimable entry for a market and return its amount."""
+        if user not in self.user_claimable:
+            return u256(0)
+
+        user_claimable = self.user_claimable[user]
+        if market_id not in user_claimable:
+            return u256(0)
+
+        amount = user_claimable[market_id]
+        del user_claimable[market_id]
+        self.user_claimable_total[user] = self.user_claimable_total[user] - amount
+        return amount
+
+    def _net_winnings(self, bet: Bet) -> u256:
+        """Winnings for a single bet after the protocol fee."""
+        gross_winnings = bet.potential_payout
+        fee = (gross_winnings * u256(self.protocol_fee_bps)) // u256(10000)
+        return gross_winnings - fee
+
+    def _credit_market_winners(self, market_id: u256, winner: i8):
+        """Record claimable winnings for every unclaimed winning bet on a market."""
+        for bet in self.bets[market_id]:
+            if not bet.claimed and bet.outcome == winner:
+                self._add_claimable(bet.user, market_id, self._net_winnings(bet))
+
     def _get_default_market(self) -> Market:
         """Return a default market for null cases."""
         return Market(
@@ -186,6 +263,7 @@ class PredictionMarket(gl.Contract):
             winner=i8(-1),
             total_pool=u256(0),
             created_at=u256(0),
+            adjudicated=False,
         )
 
     def _strip_code_fences(self, value: str) -> str:
@@ -294,6 +372,7 @@ Respond ONLY with JSON (no markdown):
             winner=i8(-1),
             total_pool=u256(0),
             created_at=current_market_id,
+            adjudicated=False,
         )
 
         self.markets[current_market_id] = market
@@ -348,6 +427,12 @@ Respond ONLY with JSON (no markdown):
         potential_payout = self._calculate_potential_payout(amount_u256, odds_text)
 
         self.user_balances[user] = user_balance - amount_u256
+        self.user_open_stake[user] = (
+            self._get_counter_or_zero(self.user_open_stake, user) + amount_u256
+        )
+        self.user_open_payout[user] = (
+            self._get_counter_or_zero(self.user_open_payout, user) + potential_payout
+        )
 
         bet = Bet(
             user=user,
@@ -436,14 +521,29 @@ Where winner is: -1=not played, 0=draw, 1=team1, 2=team2"""
         if int(winner) == -1:
             raise gl.vm.UserError("Match has not been played yet")
 
+        for bet in self.bets[market_id_u256]:
+            self.user_open_stake[bet.user] = (
+                self._get_counter_or_zero(self.user_open_stake, bet.user) - bet.amount
+            )
+            self.user_open_payout[bet.user] = (
+                self._get_counter_or_zero(self.user_open_payout, bet.user)
+                - bet.potential_payout
+            )
+
         market.winner = winner
         market.status = "resolved"
         self.markets[market_id_u256] = market
+        self._credit_market_winners(market_id_u256, winner)
 
     @gl.public.write
     def dispute_market(self, market_id: int, claimed_winner: int, stake: int):
         """
-        Dispute a resolved market's outcome.
+        Queue a dispute against a resolved market's outcome.
+
+        The stake is escrowed until the market is adjudicated with
+        adjudicate_disputes(). Claims are frozen while disputes are pending,
+        and each market gets a single adjudication round, which opens
+        DISPUTE_QUEUE_WINDOW_SECONDS after the first pending dispute.
 
         Args:
             market_id: ID of the market to dispute
@@ -460,6 +560,7 @@ Where winner is: -1=not played, 0=draw, 1=team1, 2=team2"""
             raise gl.vm.UserError("Stake must be greater than zero")
 
         user = gl.message.sender_address
+        self._ensure_user_balance(user)
 
         market_id_u256 = u256(market_id)
         claimed_winner_i8 = i8(claimed_winner)
@@ -470,87 +571,218 @@ Where winner is: -1=not played, 0=draw, 1=team1, 2=team2"""
 
         market = self.markets[market_id_u256]
 
-        if market.status != "resolved":
+        if market.status != "resolved" and market.status != "disputed":
             raise gl.vm.UserError("Can only dispute resolved markets")
 
-        if market_id_u256 in self.disputes:
-            raise gl.vm.UserError("Market already disputed")
+        if market.adjudicated:
+            raise gl.vm.UserError("Market disputes already adjudicated")
+
+        if claimed_winner_i8 == market.winner:
+            raise gl.vm.UserError("Claimed winner matches current result")
+
+        if market_id_u256 not in self.disputes:
+            self.disputes[market_id_u256] = []
 
-        user_balance = self._get_user_balance_or_default(user)
+        market_disputes = self.disputes[market_id_u256]
+        for dispute in market_disputes:
+            if dispute.disputer == user and dispute.status == "pending":
+                raise gl.vm.UserError("Dispute already pending")
+
+        user_balance = self.user_balances[user]
         if user_balance < stake_u256:
             raise gl.vm.UserError("Insufficient balance for stake")
 
+        self.user_balances[user] = user_balance - stake_u256
+        self.user_dispute_stake[user] = (
+            self._get_counter_or_zero(self.user_dispute_stake, user) + stake_u256
+        )
+
         dispute = Dispute(
             disputer=user,
             market_id=market_id_u256,
             stake=stake_u256,
             claimed_winner=claimed_winner_i8,
             status="pending",
-            created_at=market_id_u256,
+            created_at=u256(int(datetime.now().timestamp())),
         )
 
-        market_memory = gl.storage.copy_to_memory(market)
-        team1 = market_memory.team1
-        team2 = market_memory.team2
-        original_winner = int(market_memory.winner)
-        resolution_url = market_memory.resolution_url
+        market_disputes.append(dispute)
+        self.disputes[market_id_u256] = market_disputes
 
-        def leader_fn():
-            webpage_content = gl.nondet.web.get(resolution_url).body.decode("utf-8")
-            prompt = f"""Re-evaluate this match result due to a dispute.
+        market.status = "disputed"
+        self.markets[market_id_u256] = market
 
-Match: {team1} vs {team2}
-Original Resolution: Winner = {original_winner}
-Disputed Claim: Winner = {claimed_winner}
+    @gl.public.write
+    def adjudicate_disputes(self, market_ids: list[int]):
+        """
+        Rule on every pending dispute for a batch of markets.
+
+        Each market's resolution page is fetched once and all markets are
+        adjudicated in a single prompt. Upheld disputers get their stake back
+        plus an equal reward; rejected stakes are slashed. Markets the model
+        cannot decide (-1) are skipped and keep their disputes pending.
+
+        Args:
+            market_ids: IDs of disputed markets to adjudicate (at most
+                MAX_ADJUDICATION_BATCH)
+        """
+        if len(market_ids) == 0:
+            raise gl.vm.UserError("No markets to adjudicate")
+
+        if len(market_ids) > MAX_ADJUDICATION_BATCH:
+            raise gl.vm.UserError("Too many markets to adjudicate at once")
+
+        now = int(datetime.now().timestamp())
+        market_id_list = []
+        for market_id in market_ids:
+            if market_id < 0:
+                raise gl.vm.UserError("Invalid market id")
+
+            if market_id in market_id_list:
+                continue
+
+            market_id_u256 = u256(market_id)
+            if market_id_u256 not in self.markets:
+                raise gl.vm.UserError("Market does not exist")
+
+            if self.markets[market_id_u256].status != "disputed":
+                raise gl.vm.UserError("Market has no pending disputes")
+
+            first_dispute_at = min(
+                int(dispute.created_at)
+                for dispute in self.disputes[market_id_u256]
+                if dispute.status == "pending"
+            )
+            if now < first_dispute_at + DISPUTE_QUEUE_WINDOW_SECONDS:
+                raise gl.vm.UserError("Dispute window still open")
+
+            market_id_list.append(market_id)
+
+        cases = []
+        for market_id in market_id_list:
+            market_id_u256 = u256(market_id)
+            market_memory = gl.storage.copy_to_memory(self.markets[market_id_u256])
+            disputes_memory = gl.storage.copy_to_memory(self.disputes[market_id_u256])
+
+            cases.append(
+                {
+                    "market_id": market_id,
+                    "team1": market_memory.team1,
+                    "team2": market_memory.team2,
+                    "match_date": market_memory.match_date,
+                    "resolution_url": market_memory.resolution_url,
+                    "original_winner": int(market_memory.winner),
+                    "claimed_winners": [
+                        int(dispute.claimed_winner)
+                        for dispute in disputes_memory
+                        if dispute.status == "pending"
+                    ],
+                }
+            )
+
+        def leader_fn():
+            pages = {}
+            sections = []
+
+            for case in cases:
+                resolution_url = case["resolution_url"]
+                if resolution_url not in pages:
+                    pages[resolution_url] = gl.nondet.web.get(resolution_url).body.decode("utf-8")
+
+                claims = "\n".join(
+                    f"- Claim {index}: Winner = {claimed_winner}"
+                    for index, claimed_winner in enumerate(case["claimed_winners"])
+                )
+                sections.append(f"""Market {case["market_id"]}
+Match: {case["team1"]} vs {case["team2"]}
+Date: {case["match_date"]}
+Original Resolution: Winner = {case["original_winner"]}
+Disputed Claims:
+{claims}
 
 Fresh webpage content:
-{webpage_content}
+{pages[resolution_url]}""")
+
+            markets_text = "\n\n---\n\n".join(sections)
+            prompt = f"""Re-evaluate these match results due to disputes.
+
+{markets_text}
 
-Carefully analyze the content and determine:
-1. What is the correct winner?
-2. Was the original resolution incorrect?
+For every market above, carefully analyze its webpage content and
+determine the correct winner. Disputed claims that match the correct
+winner will be upheld when it differs from the original resolution.
 
-Respond ONLY with JSON:
+Respond ONLY with JSON (no markdown):
 {{
-  "correct_winner": int,
-  "dispute_valid": bool,
-  "reasoning": "brief explanation"
+  "rulings": [
+    {{"market_id": 0, "correct_winner": 1, "reasoning": "brief explanation"}}
+  ]
 }}
 
 Where correct_winner is: -1=not played, 0=draw, 1=team1, 2=team2"""
 
-            response = gl.nondet.exec_prompt(prompt)
-            response = response.replace("```json", "").replace("```", "").strip()
-            return json.loads(response)
+            response = gl.nondet.exec_prompt(prompt, response_format="json")
+            return validate_adjudication_payload(response, market_id_list)
 
         def validator_fn(leader_result) -> bool:
             if not isinstance(leader_result, gl.vm.Return):
                 return False
 
-            validator_result = leader_fn()
-            leader_data = leader_result.calldata
+            try:
+                leader_data = validate_adjudication_rulings(
+                    leader_result.calldata, market_id_list
+                )
+                validator_result = leader_fn()
+            except (AttributeError, TypeError, ValueError, KeyError, json.JSONDecodeError):
+                return False
 
-            return (
-                leader_data["correct_winner"] == validator_result["correct_winner"]
-                and leader_data["dispute_valid"] == validator_result["dispute_valid"]
-            )
+            return leader_data == validator_result
 
-        adjudication = gl.vm.run_nondet_unsafe(leader_fn, validator_fn)
-        correct_winner = i8(adjudication["correct_winner"])
-        dispute_valid = adjudication["dispute_valid"]
+        rulings = gl.vm.run_nondet_unsafe(leader_fn, validator_fn)
 
-        market.status = "resolved"
+        for market_id in market_id_list:
+            market_id_u256 = u256(market_id)
+            market = self.markets[market_id_u256]
+            correct_winner = i8(rulings[str(market_id)])
 
-        if dispute_valid:
-            market.winner = correct_winner
-            dispute.status = "upheld"
-            self.user_balances[user] = user_balance + stake_u256
-        else:
-            dispute.status = "rejected"
-            self.user_balances[user] = user_balance - stake_u256
+            if int(correct_winner) == -1:
+                # Inconclusive ruling: keep the disputes pending for a later batch.
+                continue
 
-        self.markets[market_id_u256] = market
-        self.disputes[market_id_u256] = dispute
+            winner_changed = correct_winner != market.winner
+
+            if winner_changed:
+                for bet in self.bets[market_id_u256]:
+                    self._remove_claimable(bet.user, market_id_u256)
+                self._credit_market_winners(market_id_u256, correct_winner)
+                market.winner = correct_winner
+
+            market_disputes = self.disputes[market_id_u256]
+            for i in range(len(market_disputes)):
+                dispute = market_disputes[i]
+                if dispute.status != "pending":
+                    continue
+
+                self.user_dispute_stake[dispute.disputer] = (
+                    self._get_counter_or_zero(self.user_dispute_stake, dispute.disputer)
+                    - dispute.stake
+                )
+
+                if winner_changed and dispute.claimed_winner == correct_winner:
+                    dispute.status = "upheld"
+                    self.user_balances[dispute.disputer] = self.user_balances[
+                        dispute.disputer
+                    ] + (dispute.stake * u256(2))
+                else:
+                    dispute.status = "rejected"
+
+                market_disputes[i] = dispute
+
+            self.disputes[market_id_u256] = market_disputes
+
+            market.adjudicated = True
+            market.status = "resolved"
+            self.markets[market_id_u256] = market
 
     @gl.public.write
     def claim_winnings(self, market_id: int):
@@ -583,11 +815,7 @@ Where correct_winner is: -1=not played, 0=draw, 1=team1, 2=team2"""
             bet = market_bets[i]
 
             if bet.user == user and not bet.claimed and bet.outcome == market.winner:
-                gross_winnings = bet.potential_payout
-                fee = (gross_winnings * u256(self.protocol_fee_bps)) // u256(10000)
-                net_winnings = gross_winnings - fee
-
-                total_winnings += net_winnings
+                total_winnings += self._net_winnings(bet)
                 bet.claimed = True
                 market_bets[i] = bet
 
@@ -596,6 +824,7 @@ Where correct_winner is: -1=not played, 0=draw, 1=team1, 2=team2"""
 
         self.bets[market_id_u256] = market_bets
         self.user_balances[user] = self.user_balances[user] + total_winnings
+        self._remove_claimable(user, market_id_u256)
 
     @gl.public.view
     def get_market(self, market_id: int) -> Market:
@@ -647,6 +876,41 @@ Where correct_winner is: -1=not played, 0=draw, 1=team1, 2=team2"""
         except:
             return []
 
+    @gl.public.view
+    def get_user_portfolio(self, user: str) -> dict:
+        """Get a user's balance, open exposure, dispute escrow and claimable winnings."""
+        try:
+            user_addr = Address(user)
+        except:
+            return {
+                "balance": int(self.initial_balance),
+                "open_stake": 0,
+                "open_potential_payout": 0,
+                "open_dispute_stake": 0,
+                "claimable_total": 0,
+                "claimable_by_market": {},
+            }
+
+        claimable_by_market = {}
+        if user_addr in self.user_claimable:
+            for market_id, amount in self.user_claimable[user_addr].items():
+                claimable_by_market[str(int(market_id))] = int(amount)
+
+        return {
+            "balance": int(self._get_user_balance_or_default(user_addr)),
+            "open_stake": int(self._get_counter_or_zero(self.user_open_stake, user_addr)),
+            "open_potential_payout": int(
+                self._get_counter_or_zero(self.user_open_payout, user_addr)
+            ),
+            "open_dispute_stake": int(
+                self._get_counter_or_zero(self.user_dispute_stake, user_addr)
+            ),
+            "claimable_total": int(
+                self._get_counter_or_zero(self.user_claimable_total, user_addr)
+            ),
+            "claimable_by_market": claimable_by_market,
+        }
+
     @gl.public.view
     def get_market_count(self) -> int:
         """Get total number of markets created."""
@@ -654,20 +918,13 @@ Where correct_winner is: -1=not played, 0=draw, 1=team1, 2=team2"""
 
     @gl.public.view
     def get_dispute(self, market_id: int) -> Dispute:
-        """Get dispute details for a market."""
-        if market_id < 0:
-            return Dispute(
-                disputer=Address("0x0000000000000000000000000000000000000000"),
-                market_id=u256(0),
-                stake=u256(0),
-                claimed_winner=i8(-1),
-                status="",
-                created_at=u256(0),
-            )
-
-        market_id_u256 = u256(market_id)
-        if market_id_u256 in self.disputes:
-            return self.disputes[market_id_u256]
+        """Get the most recent dispute for a market."""
+        if market_id >= 0:
+            market_id_u256 = u256(market_id)
+            if market_id_u256 in self.disputes:
+                market_disputes = self.disputes[market_id_u256]
+                if len(market_disputes) > 0:
+                    return market_disputes[len(market_disputes) - 1]
 
         return Dispute(
             disputer=Address("0x0000000000000000000000000000000000000000"),
@@ -677,3 +934,14 @@ Where correct_winner is: -1=not played, 0=draw, 1=team1, 2=team2"""
             status="",
             created_at=u256(0),
         )
+
+    @gl.public.view
+    def get_market_disputes(self, market_id: int) -> DynArray[Dispute]:
+        """Get all disputes queued against a market."""
+        if market_id < 0:
+            return []
+
+        market_id_u256 = u256(market_id)
+        if market_id_u256 in self.disputes:
+            return self.disputes[market_id_u256]
+        return []
@@ -5,6 +5,7 @@ export function MarketResolution({ market, contractHook, onResolved }) {
   const [isResolving, setIsResolving] = useState(false);
   const [isDisputing, setIsDisputing] = useState(false);
   const [isClaiming, setIsClaiming] = useState(false);
+  const [isAdjudicating, setIsAdjudicating] = useState(false);
   const [disputeData, setDisputeData] = useState({
     claimedWinner: -1,
     stake: '',
@@ -63,6 +64,25 @@ export function MarketResolution({ market, contractHook, onResolved }) {
     }
   };
 
+  const handleAdjudicate = async () => {
+    setIsAdjudicating(true);
+    setError('');
+    setSuccess('');
+
+    try {
+      await contractHook.adjudicateDisputes([market.id]);
+      setSuccess('Disputes adjudicated successfully!');
+
+      if (onResolved) {
+        onResolved();
+      }
+    } catch (err) {
+      setError(err.message || 'Failed to adjudicate disputes');
+    } finally {
+      setIsAdjudicating(false);
+    }
+  };
+
   const handleClaimWinnings = async () => {
     setIsClaiming(true);
     setError('');
@@ -152,7 +172,7 @@ export function MarketResolution({ market, contractHook, onResolved }) {
         </div>
       )}
 
-      {market.status === 'resolved' && (
+      {(market.status === 'resolved' || market.status === 'disputed') && !market.adjudicated && (
         <div className="space-y-4 rounded-xl border border-white/10 bg-white/5 p-4 sm:p-5">
           <div className="flex items-start gap-3">
             <div className="flex h-10 w-10 flex-shrink-0 items-center justify-center rounded-lg bg-warning/10">
@@ -176,9 +196,9 @@ export function MarketResolution({ market, contractHook, onResolved }) {
                 disabled={isDisputing}
               >
                 <option value={-1}>Select outcome</option>
-                <option value={0}>Draw</option>
-                <option value={1}>{market.team1}</option>
-                <option value={2}>{market.team2}</option>
+                <option value={0} disabled={market.winner === 0}>Draw</option>
+                <option value={1} disabled={market.winner === 1}>{market.team1}</option>
+                <option value={2} disabled={market.winner === 2}>{market.team2}</option>
               </select>
             </div>
 
@@ -266,6 +286,47 @@ export function MarketResolution({ market, contractHook, onResolved }) {
         </div>
       )}
 
+      {market.status === 'disputed' && (
+        <div className="space-y-4 rounded-xl border border-warning/30 bg-warning/10 p-4 sm:p-5">
+          <div className="flex items-start gap-3">
+            <div className="flex h-10 w-10 flex-shrink-0 items-center justify-center rounded-lg bg-warning/20">
+              <svg className="h-5 w-5 text-warning" fill="currentColor" viewBox="0 0 20 20">
+                <path fillRule="evenodd" d="M8.257 3.099c.765-1.36 2.722-1.36 3.486 0l5.58 9.92c.75 1.334-.213 2.98-1.742 2.98H4.42c-1.53 0-2.493-1.646-1.743-2.98l5.58-9.92zM11 13a1 1 0 11-2 0 1 1 0 012 0zm-1-8a1 1 0 00-1 1v3a1 1 0 002 0V6a1 1 0 00-1-1z" clipRule="evenodd" />
+              </svg>
+            </div>
+            <div className="flex-1">
+              <h4 className="mb-1 text-sm font-semibold text-white">Pending Disputes</h4>
+              <p className="text-sm leading-relaxed text-gray-400">
+                Claims are frozen until the queued disputes are adjudicated. Anyone can trigger the ruling one hour after the first dispute.
+              </p>
+            </div>
+          </div>
+
+          <button
+            onClick={handleAdjudicate}
+            disabled={isAdjudicating}
+            className="flex w-full items-center justify-center gap-2 rounded-lg bg-warning py-3 font-semibold text-black transition-all duration-200 hover:bg-warning/90 disabled:cursor-not-allowed disabled:bg-white/10 disabled:text-gray-600"
+          >
+            {isAdjudicating ? (
+              <>
+                <svg className="h-5 w-5 animate-spin" fill="none" viewBox="0 0 24 24">
+                  <circle className="opacity-25" cx="12" cy="12" r="10" stroke="currentColor" strokeWidth="4" />
+                  <path className="opacity-75" fill="currentColor" d="M4 12a8 8 0 018-8V0C5.373 0 0 5.373 0 12h4zm2 5.291A7.962 7.962 0 014 12H0c0 3.042 1.135 5.824 3 7.938l3-2.647z" />
+                </svg>
+                Adjudicating...
+              </>
+            ) : (
+              <>
+                <svg className="h-5 w-5" fill="currentColor" viewBox="0 0 20 20">
+                  <path fillRule="evenodd" d="M10 18a8 8 0 100-16 8 8 0 000 16zm3.707-9.293a1 1 0 00-1.414-1.414L9 10.586 7.707 9.293a1 1 0 00-1.414 1.414l2 2a1 1 0 001.414 0l4-4z" clipRule="evenodd" />
+                </svg>
+                Adjudicate Disputes
+              </>
+            )}
+          </button>
+        </div>
+      )}
+
       {market.status === 'resolved' && (
         <div className="rounded-xl border border-white/10 bg-white/5 p-4">
           <div className="flex flex-col gap-2 sm:flex-row sm:items-center sm:justify-between">
@@ -9,6 +9,7 @@ import {
   convertMarket, 
   convertBet, 
   convertDispute,
+  convertPortfolio,
   formatAddressForContract 
 } from '../utils/genlayerUtils';
 
@@ -198,6 +199,11 @@ export function useContract() {
     return [];
   }, [readContract]);
 
+  const getUserPortfolio = useCallback(async (address) => {
+    const result = await readContract('get_user_portfolio', [address]);
+    return convertPortfolio(result);
+  }, [readContract]);
+
   const getMarketCount = useCallback(async () => {
     const result = await readContract('get_market_count', []);
     return Number(result);
@@ -208,6 +214,14 @@ export function useContract() {
     return convertDispute(result);
   }, [readContract]);
 
+  const getMarketDisputes = useCallback(async (marketId) => {
+    const result = await readContract('get_market_disputes', [marketId]);
+    if (Array.isArray(result)) {
+      return result.map(dispute => convertDispute(dispute));
+    }
+    return [];
+  }, [readContract]);
+
   const createMarket = useCallback((team1, team2, league, matchDate, resolutionUrl, generateOdds, fixtureId) => {
     return writeContract('create_market', [team1, team2, league, matchDate, resolutionUrl, generateOdds, fixtureId]);
   }, [writeContract]);
@@ -224,6 +238,10 @@ export function useContract() {
     return writeContract('dispute_market', [marketId, claimedWinner, stake]);
   }, [writeContract]);
 
+  const adjudicateDisputes = useCallback((marketIds) => {
+    return writeContract('adjudicate_disputes', [marketIds]);
+  }, [writeContract]);
+
   const claimWinnings = useCallback(async (marketId) => {
     const receipt = await writeContract('claim_winnings', [marketId]);
     // ✅ Balance will auto-refresh after writeContract completes
@@ -244,13 +262,16 @@ export function useContract() {
     getUserBalance,
     getMarketBets,
     getUserBets,
+    getUserPortfolio,
     getMarketCount,
     getDispute,
+    getMarketDisputes,
     // Write methods
     createMarket,
     placeBet,
     resolveMarket,
     disputeMarket,
+    adjudicateDisputes,
     claimWinnings,
   };
 }
\ No newline at end of file
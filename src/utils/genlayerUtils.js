@@ -86,6 +86,7 @@ export function convertMarket(marketData) {
     winner: market.winner ?? -1,
     total_pool: market.total_pool ?? 0,
     created_at: market.created_at ?? 0,
+    adjudicated: market.adjudicated ?? false,
   };
 }
 
@@ -126,6 +127,27 @@ export function convertDispute(disputeData) {
   };
 }
 
+/**
+ * Convert a user portfolio from GenLayer format
+ */
+export function convertPortfolio(portfolioData) {
+  const portfolio = convertGenLayerData(portfolioData) ?? {};
+  const claimableByMarket = {};
+
+  for (const [marketId, amount] of Object.entries(portfolio.claimable_by_market ?? {})) {
+    claimableByMarket[marketId] = Number(amount);
+  }
+
+  return {
+    balance: Number(portfolio.balance ?? 0),
+    open_stake: Number(portfolio.open_stake ?? 0),
+    open_potential_payout: Number(portfolio.open_potential_payout ?? 0),
+    open_dispute_stake: Number(portfolio.open_dispute_stake ?? 0),
+    claimable_total: Number(portfolio.claimable_total ?? 0),
+    claimable_by_market: claimableByMarket,
+  };
+}
+
 /**
  * Format an address for GenLayer contract calls
  * Ensures address is in the correct format